@@ -63,6 +63,27 @@ def wait_for_cr_status(
 
     assert actual_status == desired_status
 
+def wait_for_k8s_gone(
+    reference: k8s.CustomResourceReference,
+    timeout: float = 30,
+    initial: float = 0.25,
+    factor: float = 2.0,
+    cap: float = 4.0,
+) -> bool:
+    """
+    Waits for the CR to no longer exist, polling with an exponentially growing
+    interval capped at `cap` seconds. Returns whether the CR is gone.
+    """
+    deadline = time.time() + timeout
+    interval = initial
+    while k8s.get_resource_exists(reference):
+        if time.time() >= deadline:
+            logging.error(f"Wait for {reference.name} to be deleted timed out")
+            return False
+        time.sleep(interval)
+        interval = min(interval * factor, cap)
+    return True
+
 def get_resource_tags(resource_arn: str):
     region = get_region()
     ddb_client = boto3.client('dynamodb', region_name=region)
@@ -13,7 +13,12 @@
 
 """Utility functions to help processing Kubernetes resource conditions"""
 
+import logging
+import time
+from typing import Optional
+
 import pytest
+from kubernetes import client, watch
 
 from acktest.k8s import resource
 
@@ -25,6 +30,8 @@ CONDITION_TYPE_ADVISORY = "ACK.Advisory"
 CONDITION_TYPE_LATE_INITIALIZED = "ACK.LateInitialized"
 CONDITION_TYPE_REFERENCES_RESOLVED = "ACK.ReferencesResolved"
 
+WATCH_RESTART_DELAY_SECONDS = 1
+
 
 def assert_type_status(
     ref: resource.CustomResourceReference,
@@ -66,6 +73,47 @@ def assert_type_status(
         pytest.fail(msg)
 
 
+def wait_for_condition_status(
+    ref: resource.CustomResourceReference,
+    cond_type: str,
+    cond_status: str,
+    timeout_seconds: int,
+) -> Optional[dict]:
+    """Watches the custom resource until a condition of the supplied type
+    reaches the supplied status.
+
+    Returns the matching condition as soon as it is observed, or None if it
+    is not observed before the timeout.
+    """
+    api = client.CustomObjectsApi(resource._get_k8s_api_client())
+    deadline = time.time() + timeout_seconds
+    # The API server may close a watch before its timeout or end it with an
+    # ERROR event (e.g. 410 Gone), so keep re-establishing it until the
+    # deadline passes.
+    while time.time() < deadline:
+        w = watch.Watch()
+        for event in w.stream(
+            api.list_namespaced_custom_object,
+            group=ref.group,
+            version=ref.version,
+            namespace=ref.namespace,
+            plural=ref.plural,
+            field_selector=f"metadata.name={ref.name}",
+            timeout_seconds=max(1, int(deadline - time.time())),
+        ):
+            if event["type"] == "ERROR":
+                logging.debug(f"Restarting watch on {ref.name}: {event['object']}")
+                w.stop()
+                time.sleep(WATCH_RESTART_DELAY_SECONDS)
+                break
+            conditions = event["object"].get("status", {}).get("conditions", [])
+            for cond in conditions:
+                if cond.get("type") == cond_type and str(cond.get("status")) == cond_status:
+                    w.stop()
+                    return cond
+    return None
+
+
 def assert_synced_status(
     ref: resource.CustomResourceReference,
     cond_status_match: bool,
@@ -20,11 +20,26 @@ import logging
 
 import boto3
 import pytest
+from botocore.config import Config
 
 from acktest.aws.identity import get_region
 
 DEFAULT_WAIT_UNTIL_TIMEOUT_SECONDS = 60
 DEFAULT_WAIT_UNTIL_INTERVAL_SECONDS = 5
+DEFAULT_BACKOFF_INITIAL_SECONDS = 1
+DEFAULT_BACKOFF_FACTOR = 1.5
+DEFAULT_BACKOFF_MAX_INTERVAL_SECONDS = 10
+
+# Shared by every helper in this module so that credential resolution and
+# HTTPS connections are reused across DescribeTable calls.
+_CLIENT = boto3.client(
+    'dynamodb',
+    region_name=get_region(),
+    config=Config(
+        max_pool_connections=25,
+        retries={'mode': 'standard', 'max_attempts': 5},
+    ),
+)
 
 TableMatchFunc = typing.NewType(
     'TableMatchFunc',
@@ -195,15 +210,32 @@ class GSIMatcher:
 def gsi_matches(gsis) -> TableMatchFunc:
     return GSIMatcher(gsis)
 
+
+class AllMatcher:
+    def __init__(self, match_fns):
+        self.match_fns = match_fns
+
+    def __call__(self, record: dict) -> bool:
+        return all(match_fn(record) for match_fn in self.match_fns)
+
+
+def all_conditions(*match_fns: TableMatchFunc) -> TableMatchFunc:
+    return AllMatcher(match_fns)
+
 def wait_until(
         table_name: str,
         match_fn: TableMatchFunc,
         timeout_seconds: int = DEFAULT_WAIT_UNTIL_TIMEOUT_SECONDS,
-        interval_seconds: int = DEFAULT_WAIT_UNTIL_INTERVAL_SECONDS,
+        interval_seconds: float = DEFAULT_WAIT_UNTIL_INTERVAL_SECONDS,
+        backoff_factor: float = 1,
+        max_interval_seconds: typing.Optional[float] = None,
     ) -> None:
     """Waits until a Table with a supplied name is returned from the DynamoDB
     API and the matching functor returns True.
 
+    The polling interval is multiplied by backoff_factor after each attempt,
+    capped at max_interval_seconds if supplied.
+
     Usage:
         from e2e.table import wait_until, status_matches
 
@@ -217,11 +249,39 @@ def wait_until(
     """
     now = datetime.datetime.now()
     timeout = now + datetime.timedelta(seconds=timeout_seconds)
+    interval = interval_seconds
 
     while not match_fn(get(table_name)):
         if datetime.datetime.now() >= timeout:
             pytest.fail("failed to match table before timeout")
-        time.sleep(interval_seconds)
+        time.sleep(interval)
+        interval *= backoff_factor
+        if max_interval_seconds is not None:
+            interval = min(interval, max_interval_seconds)
+
+
+def wait_until_backoff(
+        table_name: str,
+        match_fn: TableMatchFunc,
+        initial: float = DEFAULT_BACKOFF_INITIAL_SECONDS,
+        factor: float = DEFAULT_BACKOFF_FACTOR,
+        max_interval: float = DEFAULT_BACKOFF_MAX_INTERVAL_SECONDS,
+        timeout_seconds: int = DEFAULT_WAIT_UNTIL_TIMEOUT_SECONDS,
+    ) -> None:
+    """Waits like wait_until, but polls with an interval that starts at
+    initial and grows by factor up to max_interval.
+
+    Raises:
+        pytest.fail upon timeout
+    """
+    wait_until(
+        table_name,
+        match_fn,
+        timeout_seconds=timeout_seconds,
+        interval_seconds=initial,
+        backoff_factor=factor,
+        max_interval_seconds=max_interval,
+    )
 
 
 def get(table_name):
@@ -229,11 +289,10 @@ def get(table_name):
 
     If no such Table exists, returns None.
     """
-    c = boto3.client('dynamodb', region_name=get_region())
     try:
-        resp = c.describe_table(TableName=table_name)
+        resp = _CLIENT.describe_table(TableName=table_name)
         return resp['Table']
-    except c.exceptions.ResourceNotFoundException:
+    except _CLIENT.exceptions.ResourceNotFoundException:
         return None
 
 def get_insights(table_name):
@@ -241,11 +300,10 @@ def get_insights(table_name):
 
     If no such Table exists, returns None.
     """
-    c = boto3.client('dynamodb', region_name=get_region())
     try:
-        resp = c.describe_contributor_insights(TableName=table_name)
+        resp = _CLIENT.describe_contributor_insights(TableName=table_name)
         return resp['ContributorInsightsStatus']
-    except c.exceptions.ResourceNotFoundException:
+    except _CLIENT.exceptions.ResourceNotFoundException:
         return None
 
 
@@ -254,11 +312,10 @@ def get_time_to_live(table_name):
 
     If no such Table exists, returns None.
     """
-    c = boto3.client('dynamodb', region_name=get_region())
     try:
-        resp = c.describe_time_to_live(TableName=table_name)
+        resp = _CLIENT.describe_time_to_live(TableName=table_name)
         return resp['TimeToLiveDescription']
-    except c.exceptions.ResourceNotFoundException:
+    except _CLIENT.exceptions.ResourceNotFoundException:
         return None
 
 def get_point_in_time_recovery_enabled(table_name):
@@ -266,11 +323,10 @@ def get_point_in_time_recovery_enabled(table_name):
 
     If no such Table exists, returns None.
     """
-    c = boto3.client('dynamodb', region_name=get_region())
     try:
-        resp = c.describe_continuous_backups(TableName=table_name)
+        resp = _CLIENT.describe_continuous_backups(TableName=table_name)
         return resp['ContinuousBackupsDescription']['PointInTimeRecoveryDescription']['PointInTimeRecoveryStatus'] == 'ENABLED'
-    except c.exceptions.ResourceNotFoundException:
+    except _CLIENT.exceptions.ResourceNotFoundException:
         return None
 
 
@@ -322,11 +378,10 @@ def get_replicas(table_name):
     Returns:
         A list of replicas or None if the table doesn't exist
     """
-    dynamodb = boto3.client('dynamodb')
     try:
-        response = dynamodb.describe_table(TableName=table_name)
+        response = _CLIENT.describe_table(TableName=table_name)
         if 'Table' in response and 'Replicas' in response['Table']:
             return response['Table']['Replicas']
         return []
-    except dynamodb.exceptions.ResourceNotFoundException:
+    except _CLIENT.exceptions.ResourceNotFoundException:
         return None
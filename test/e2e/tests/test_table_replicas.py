@@ -14,7 +14,11 @@
 """Integration tests for the DynamoDB Table Replicas.
 """
 
+import copy
+import functools
+import json
 import logging
+import re
 import time
 from typing import Dict, Tuple
 
@@ -24,14 +28,14 @@ from acktest import tags
 from acktest.k8s import resource as k8s
 from acktest.resources import random_suffix_name
 from e2e import (CRD_GROUP, CRD_VERSION, condition,
-                 load_dynamodb_resource, service_marker, table)
+                 load_dynamodb_resource, service_marker, table,
+                 wait_for_k8s_gone)
+from e2e.condition import wait_for_condition_status
 from e2e.replacement_values import REPLACEMENT_VALUES
 from acktest.k8s import condition
 
 RESOURCE_PLURAL = "tables"
 CREATE_WAIT_AFTER_SECONDS = 30
-DELETE_WAIT_AFTER_SECONDS = 30
-MODIFY_WAIT_AFTER_SECONDS = 600
 REPLICA_WAIT_AFTER_SECONDS = 600
 
 REPLICA_REGION_1 = "us-east-1"
@@ -41,19 +45,43 @@ REPLICA_REGION_4 = "ap-southeast-1"
 REPLICA_REGION_5 = "eu-north-1"
 
 
+@functools.lru_cache(maxsize=16)
+def _load_template(resource_template: str) -> dict:
+    return load_dynamodb_resource(
+        resource_template,
+        additional_replacements=REPLACEMENT_VALUES,
+    )
+
+
+def render_table_resource(resource_template: str, name: str, regions) -> dict:
+    """Returns a copy of the parsed resource template with the table name and
+    replica regions filled in.
+
+    The template is only read and parsed once; the per-table fields are set
+    directly on a deep copy instead of re-running placeholder replacement.
+    """
+    resource_data = copy.deepcopy(_load_template(resource_template))
+    resource_data["metadata"]["name"] = name
+    resource_data["spec"]["tableName"] = name
+
+    replicas = resource_data["spec"]["tableReplicas"]
+    assert len(regions) == len(replicas), (
+        f"{resource_template} expects {len(replicas)} replica regions, "
+        f"got {len(regions)}")
+    for replica, region in zip(replicas, regions):
+        replica["regionName"] = region
+
+    placeholders = re.findall(r"\$[A-Z0-9_]+", json.dumps(resource_data))
+    assert not placeholders, (
+        f"unreplaced placeholders in {resource_template}: {placeholders}")
+    return resource_data
+
+
 def create_table_with_replicas(name: str, resource_template, regions=None):
     if regions is None:
         regions = [REPLICA_REGION_1, REPLICA_REGION_2]
 
-    replacements = REPLACEMENT_VALUES.copy()
-    replacements["TABLE_NAME"] = name
-    replacements["REPLICA_REGION_1"] = regions[0]
-    replacements["REPLICA_REGION_2"] = regions[1]
-
-    resource_data = load_dynamodb_resource(
-        resource_template,
-        additional_replacements=replacements,
-    )
+    resource_data = render_table_resource(resource_template, name, regions)
     logging.debug(resource_data)
 
     # Create the k8s resource
@@ -70,6 +98,19 @@ def create_table_with_replicas(name: str, resource_template, regions=None):
     return (ref, cr)
 
 
+def delete_table_resource(ref: k8s.CustomResourceReference):
+    # Delete the k8s resource if the test did not already do so
+    if k8s.get_resource_exists(ref):
+        k8s.delete_custom_resource(ref)
+
+    # Best effort: a replicated table can take minutes to delete and that
+    # should not fail the test that used it.
+    if not wait_for_k8s_gone(ref):
+        logging.warning(f"Table {ref.name} was not deleted before teardown finished")
+
+
+# NOTE: Each test gets its own table so that the replica tests do not depend
+# on each other's state or on the order they run in.
 @pytest.fixture(scope="function")
 def table_with_replicas():
     table_name = random_suffix_name("table-replicas", 32)
@@ -80,36 +121,26 @@ def table_with_replicas():
         [REPLICA_REGION_1, REPLICA_REGION_2]
     )
 
-    # Wait for table to be ACTIVE before proceeding
-    table.wait_until(
+    # Wait for table to be ACTIVE with its initial replicas before yielding
+    table.wait_until_backoff(
         table_name,
-        table.status_matches("ACTIVE"),
-        timeout_seconds=REPLICA_WAIT_AFTER_SECONDS,
-        interval_seconds=30,
-    )
-
-    # Wait for initial replicas to be ACTIVE before yielding
-    table.wait_until(
-        table_name,
-        table.replicas_match([REPLICA_REGION_1, REPLICA_REGION_2]),
+        table.all_conditions(
+            table.status_matches("ACTIVE"),
+            table.replicas_match([REPLICA_REGION_1, REPLICA_REGION_2]),
+        ),
         timeout_seconds=REPLICA_WAIT_AFTER_SECONDS,
-        interval_seconds=30,
     )
 
     yield (ref, res)
 
+    delete_table_resource(ref)
 
-    deleted = k8s.delete_custom_resource(ref)
-    assert deleted
 
 def create_table_with_invalid_replicas(name: str):
-    replacements = REPLACEMENT_VALUES.copy()
-    replacements["TABLE_NAME"] = name
-    replacements["REPLICA_REGION_1"] = REPLICA_REGION_1
-
-    resource_data = load_dynamodb_resource(
+    resource_data = render_table_resource(
         "table_with_replicas_invalid",
-        additional_replacements=replacements,
+        name,
+        [REPLICA_REGION_1],
     )
     logging.debug(resource_data)
 
@@ -136,23 +167,16 @@ def table_with_invalid_replicas():
 
     yield (ref, res)
 
-    # Delete the k8s resource if it still exists
-    if k8s.get_resource_exists(ref):
-        k8s.delete_custom_resource(ref)
-        time.sleep(DELETE_WAIT_AFTER_SECONDS)
+    delete_table_resource(ref)
 
 
 @pytest.fixture(scope="function")
 def table_replicas_gsi():
     table_name = random_suffix_name("table-replicas-gsi", 32)
-    replacements = REPLACEMENT_VALUES.copy()
-    replacements["TABLE_NAME"] = table_name
-    replacements["REPLICA_REGION_1"] = REPLICA_REGION_1
-    replacements["REPLICA_REGION_2"] = REPLICA_REGION_2
-
-    resource_data = load_dynamodb_resource(
+    resource_data = render_table_resource(
         "table_with_gsi_and_replicas",
-        additional_replacements=replacements,
+        table_name,
+        [REPLICA_REGION_1, REPLICA_REGION_2],
     )
 
     ref = k8s.CustomResourceReference(
@@ -171,9 +195,7 @@ def table_replicas_gsi():
 
     yield (ref, cr)
 
-    deleted = k8s.delete_custom_resource(ref)
-    time.sleep(DELETE_WAIT_AFTER_SECONDS)
-    assert deleted
+    delete_table_resource(ref)
 
 @service_marker
 @pytest.mark.canary
@@ -185,23 +207,24 @@ class TestTableReplicas:
         (_, res) = table_with_replicas
         table_name = res["spec"]["tableName"]
 
-        # Table should already be ACTIVE from fixture
-        assert table.get(table_name) is not None
-
-        # Verify replicas exist and are ACTIVE
-        for region in [REPLICA_REGION_1, REPLICA_REGION_2]:
-            table.wait_until(
-                table_name,
-                table.replica_status_matches(region, "ACTIVE"),
-                timeout_seconds=REPLICA_WAIT_AFTER_SECONDS,
-                interval_seconds=30,
-            )
+        # Verify the table, its replicas and their status from a single
+        # DescribeTable response per poll
+        table.wait_until_backoff(
+            table_name,
+            table.all_conditions(
+                table.status_matches("ACTIVE"),
+                table.replicas_match([REPLICA_REGION_1, REPLICA_REGION_2]),
+                table.replica_status_matches(REPLICA_REGION_1, "ACTIVE"),
+                table.replica_status_matches(REPLICA_REGION_2, "ACTIVE"),
+            ),
+            timeout_seconds=REPLICA_WAIT_AFTER_SECONDS,
+        )
 
     def test_add_replica(self, table_with_replicas):
         (ref, res) = table_with_replicas
         table_name = res["spec"]["tableName"]
 
-        assert table.get(table_name) is not None
+        assert self.table_exists(table_name)
         table.wait_until(
             table_name,
             table.status_matches("ACTIVE"),
@@ -217,44 +240,36 @@ class TestTableReplicas:
             {"regionName": REPLICA_REGION_5}
         ]
         k8s.patch_custom_resource(ref, cr)
-        table.wait_until(
+
+        # Wait for the new replica set with all replicas ACTIVE
+        new_regions = [REPLICA_REGION_3, REPLICA_REGION_4, REPLICA_REGION_5]
+        table.wait_until_backoff(
             table_name,
-            table.replicas_match(
-                [REPLICA_REGION_3, REPLICA_REGION_4, REPLICA_REGION_5]),
+            table.all_conditions(
+                table.replicas_match(new_regions),
+                *[table.replica_status_matches(region, "ACTIVE")
+                  for region in new_regions],
+            ),
             timeout_seconds=REPLICA_WAIT_AFTER_SECONDS,
-            interval_seconds=30,
         )
 
-        # Verify all replicas are ACTIVE
-        for region in [REPLICA_REGION_3, REPLICA_REGION_4, REPLICA_REGION_5]:
-            table.wait_until(
-                table_name,
-                table.replica_status_matches(region, "ACTIVE"),
-                timeout_seconds=REPLICA_WAIT_AFTER_SECONDS,
-                interval_seconds=30,
-            )
-
     def test_remove_replica(self, table_with_replicas):
         (ref, res) = table_with_replicas
         table_name = res["spec"]["tableName"]
 
         assert self.table_exists(table_name)
 
-        table.wait_until(
+        initial_regions = [REPLICA_REGION_1, REPLICA_REGION_2]
+        table.wait_until_backoff(
             table_name,
-            table.replicas_match([REPLICA_REGION_1, REPLICA_REGION_2]),
+            table.all_conditions(
+                table.replicas_match(initial_regions),
+                *[table.replica_status_matches(region, "ACTIVE")
+                  for region in initial_regions],
+            ),
             timeout_seconds=REPLICA_WAIT_AFTER_SECONDS,
-            interval_seconds=30,
         )
 
-        for region in [REPLICA_REGION_1, REPLICA_REGION_2]:
-            table.wait_until(
-                table_name,
-                table.replica_status_matches(region, "ACTIVE"),
-                timeout_seconds=REPLICA_WAIT_AFTER_SECONDS,
-                interval_seconds=30,
-            )
-
         cr = k8s.wait_resource_consumed_by_controller(ref)
         current_replicas = table.get_replicas(table_name)
         assert current_replicas is not None
@@ -273,11 +288,10 @@ class TestTableReplicas:
         k8s.patch_custom_resource(ref, cr)
 
         # Wait for the replica to be removed
-        table.wait_until(
+        table.wait_until_backoff(
             table_name,
             table.replicas_match(regions_to_keep),
             timeout_seconds=REPLICA_WAIT_AFTER_SECONDS,
-            interval_seconds=30,
         )
 
         # Verify remaining replicas
@@ -291,40 +305,41 @@ class TestTableReplicas:
         for region in regions_to_remove:
             assert region not in region_names
 
-    def test_delete_table_with_replicas(self, table_with_replicas):
+    def test_delete_table_with_replicas(self, table_with_replicas, dynamodb_client):
         (ref, res) = table_with_replicas
 
         table_name = res["spec"]["tableName"]
         assert self.table_exists(table_name)
 
+        # The controller removes the replicas before deleting the table
+        # itself, so the CR takes minutes rather than seconds to go away.
+        k8s.delete_custom_resource(ref)
+        assert wait_for_k8s_gone(ref, timeout=REPLICA_WAIT_AFTER_SECONDS)
+
+        # Returns as soon as DynamoDB reports the table gone
+        dynamodb_client.get_waiter("table_not_exists").wait(
+            TableName=table_name,
+            WaiterConfig={
+                "Delay": 2,
+                "MaxAttempts": REPLICA_WAIT_AFTER_SECONDS // 2,
+            },
+        )
+
     def test_terminal_condition_for_invalid_stream_specification(self, table_with_invalid_replicas):
         (ref, res) = table_with_invalid_replicas
 
         table_name = res["spec"]["tableName"]
         assert self.table_exists(table_name)
 
-        max_wait_seconds = 120
-        interval_seconds = 10
-        start_time = time.time()
-        terminal_condition_found = False
-
-        while time.time() - start_time < max_wait_seconds:
-            try:
-                condition.assert_type_status(
-                    ref,
-                    condition.CONDITION_TYPE_TERMINAL,
-                    True)
-
-                terminal_condition_found = True
-                cond = k8s.get_resource_condition(
-                    ref, condition.CONDITION_TYPE_TERMINAL)
-                assert "table must have DynamoDB Streams enabled with StreamViewType set to NEW_AND_OLD_IMAGES" in cond[
-                    "message"]
-                break
-            except:
-                time.sleep(interval_seconds)
-
-        assert terminal_condition_found, "Terminal condition was not set for invalid StreamSpecification"
+        cond = wait_for_condition_status(
+            ref,
+            condition.CONDITION_TYPE_TERMINAL,
+            "True",
+            timeout_seconds=120,
+        )
+        assert cond is not None, "Terminal condition was not set for invalid StreamSpecification"
+        assert "table must have DynamoDB Streams enabled with StreamViewType set to NEW_AND_OLD_IMAGES" in cond[
+            "message"]
 
     def test_staged_replicas_and_gsi_updates(self, table_replicas_gsi):
         (ref, cr) = table_replicas_gsi
@@ -415,22 +430,17 @@ class TestTableReplicas:
             interval_seconds=30,
         )
 
-        table.wait_until(
+        expected_regions = [REPLICA_REGION_1, REPLICA_REGION_2, REPLICA_REGION_3]
+        table.wait_until_backoff(
             table_name,
-            table.replicas_match(
-                [REPLICA_REGION_1, REPLICA_REGION_2, REPLICA_REGION_3]),
+            table.all_conditions(
+                table.replicas_match(expected_regions),
+                *[table.replica_status_matches(region, "ACTIVE")
+                  for region in expected_regions],
+            ),
             timeout_seconds=REPLICA_WAIT_AFTER_SECONDS*2,
-            interval_seconds=30,
         )
 
-        for region in [REPLICA_REGION_1, REPLICA_REGION_2, REPLICA_REGION_3]:
-            table.wait_until(
-                table_name,
-                table.replica_status_matches(region, "ACTIVE"),
-                timeout_seconds=REPLICA_WAIT_AFTER_SECONDS,
-                interval_seconds=30,
-            )
-
         table_info = table.get(table_name)
         assert "GlobalSecondaryIndexes" in table_info
         assert len(table_info["GlobalSecondaryIndexes"]) == 2